@@ -1,12 +1,29 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+import joblib
 import yfinance as yf
+import numpy as np
+from numba import njit
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.utils
+import pyarrow as pa
+import pyarrow.ipc as ipc
 from dash import Dash, html, dcc, dash_table, Input, Output
 import dash_bootstrap_components as dbc
 
+logger = logging.getLogger(__name__)
+
 # Ticker mapping
 TICKER_MAP = {
     'Apple': 'AAPL', 'Adobe': 'ADBE', 'AMD': 'AMD', 'Uber Technologies Inc': 'UBER',
@@ -25,152 +42,392 @@ TICKER_MAP = {
 }
 
 tickers = list(TICKER_MAP.values())
+start_date = "2003-01-01"
+initial_value = 10000
+portfolio_size = 10
 end_date = datetime.datetime.today().strftime('%Y-%m-%d')
+CACHE_DIR = Path(os.environ.get("PRICE_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+TICKERS_KEY = hashlib.sha1(",".join(sorted(tickers)).encode()).hexdigest()[:12]
+# Bump whenever DashboardState or the tables/figures it holds change shape,
+# so a persisted state from an older build is not served
+STATE_VERSION = 1
 
 # === Step 1: Download and preprocess data ===
-prices = yf.download(tickers, start="2003-01-01", end=end_date, auto_adjust=True)["Close"]
-yearly_prices = prices.resample('YE').last()
-annual_returns = yearly_prices.pct_change(fill_method=None).dropna(how='all')
+def fetch_close(ticker, start, end):
+    history = yf.Ticker(ticker).history(start=start, end=end, auto_adjust=True)
+    if history.empty:
+        return None
+    close = history["Close"].rename(ticker)
+    # Match yf.download's naive exchange-local dates used by the cache
+    close.index = close.index.tz_localize(None)
+    return close
+
+def download_close(start, end):
+    # Each ticker is fetched as a flat Series on its own Ticker object, which
+    # unlike yf.download keeps no shared state, so the requests can overlap.
+    # A ticker that fails (rate limit, network error) is logged and left as an
+    # empty column; the failed tickers are returned alongside the frame.
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = {ticker: executor.submit(fetch_close, ticker, start, end) for ticker in tickers}
+    series = []
+    failed = []
+    for ticker, future in futures.items():
+        try:
+            close = future.result()
+        except Exception:
+            logger.warning("Failed to download %s", ticker, exc_info=True)
+            failed.append(ticker)
+            continue
+        if close is not None:
+            series.append(close)
+    if not series:
+        return pd.DataFrame(), failed
+    return pd.concat(series, axis=1).sort_index().reindex(columns=tickers), failed
+
+def load_prices():
+    # Close prices are cached as Parquet per ticker set; only the days from
+    # the last cached date on are fetched from Yahoo. Also reports whether
+    # every ticker downloaded, i.e. whether the prices are safe to persist.
+    path = CACHE_DIR / f"prices_{TICKERS_KEY}.parquet"
+    cached = read_cached_prices(path)
+
+    if cached is not None:
+        last_date = cached.index.max()
+        if last_date + pd.Timedelta(days=1) >= pd.Timestamp(end_date):
+            return cached, True
+        new, failed = download_close(last_date.strftime('%Y-%m-%d'), end_date)
+        if new.empty:
+            return cached, not failed
+        if history_unchanged(cached, new, last_date):
+            # Re-fetched prices win on the overlapping day, but a gap in the
+            # new rows never erases a cached price
+            prices = new[cached.columns].combine_first(cached)[cached.columns]
+        else:
+            # A split or dividend re-adjusted the history Yahoo serves, so the
+            # cached rows are on a different price basis; start over
+            prices, failed = download_close(start_date, end_date)
+    else:
+        prices, failed = download_close(start_date, end_date)
+
+    if prices.empty:
+        raise RuntimeError("No price data could be downloaded from Yahoo Finance")
+    # A partial download is used for this run but never cached, otherwise
+    # the failed tickers' history would not be fetched again
+    if failed:
+        return prices, False
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    prices.to_parquet(tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return prices, True
+
+def read_cached_prices(path):
+    # A missing, unreadable or empty cache file counts as a cache miss
+    if not path.exists():
+        return None
+    try:
+        cached = pd.read_parquet(path)
+    except Exception:
+        logger.warning("Ignoring unreadable price cache %s", path, exc_info=True)
+        return None
+    if cached.empty or not isinstance(cached.index, pd.DatetimeIndex):
+        return None
+    return cached
+
+def history_unchanged(cached, new, last_date):
+    # The re-fetched last cached day must match the cached row wherever both
+    # have a price; auto-adjusted closes shift when Yahoo re-adjusts history
+    if last_date not in new.index:
+        return False
+    cached_row = cached.loc[last_date]
+    new_row = new.loc[last_date, cached.columns]
+    both = cached_row.notna() & new_row.notna()
+    return np.allclose(new_row[both], cached_row[both], rtol=1e-6)
 
 # === Step 2: Portfolio Simulation ===
-initial_value = 10000
-top_portfolio = [initial_value]
-bottom_portfolio = [initial_value]
-years = [annual_returns.index[0].year]  # e.g., 2004
-
-detailed_records = []
-
-for i in range(len(annual_returns) - 1):
-    current_year = annual_returns.index[i].year
-    next_year = annual_returns.index[i + 1].year
-    current_returns = annual_returns.iloc[i].dropna()
-    next_returns = annual_returns.iloc[i + 1].dropna()
-    valid_stocks = current_returns.index.intersection(next_returns.index)
-
-    top10 = current_returns[valid_stocks].sort_values(ascending=False).head(10)
-    bottom10 = current_returns[valid_stocks].sort_values().head(10)
-
-    top_avg = next_returns[top10.index].mean()
-    bottom_avg = next_returns[bottom10.index].mean()
-
-    top_value = top_portfolio[-1] * (1 + top_avg)
-    bottom_value = bottom_portfolio[-1] * (1 + bottom_avg)
-
-    top_portfolio.append(top_value)
-    bottom_portfolio.append(bottom_value)
-    years.append(next_year)
-
-    for stock, ret in top10.items():
-        detailed_records.append({
-            "Year": next_year,
-            "Category": "Top 10",
-            "Stock": stock,
-            "Return %": round(ret * 100, 2)
-        })
-    for stock, ret in bottom10.items():
-        detailed_records.append({
-            "Year": next_year,
-            "Category": "Bottom 10",
-            "Stock": stock,
-            "Return %": round(ret * 100, 2)
+@njit(cache=True)
+def simulate(R, k):
+    # For each year pick the k best/worst performers among stocks that also
+    # trade the following year and average their next-year returns.
+    # Index rows are ordered best-first/worst-first and padded with -1.
+    Y = R.shape[0]
+    top_avg = np.full(Y - 1, np.nan)
+    bottom_avg = np.full(Y - 1, np.nan)
+    top_idx = np.full((Y - 1, k), -1, dtype=np.int64)
+    bottom_idx = np.full((Y - 1, k), -1, dtype=np.int64)
+    for i in range(Y - 1):
+        valid = np.flatnonzero(~np.isnan(R[i]) & ~np.isnan(R[i + 1]))
+        if valid.size == 0:
+            continue
+        # Partition out the k extremes, then sort only those for display
+        values = R[i][valid]
+        n = min(k, valid.size)
+        top = np.argpartition(-values, n - 1)[:n]
+        top = valid[top[np.argsort(-values[top])]]
+        bottom = np.argpartition(values, n - 1)[:n]
+        bottom = valid[bottom[np.argsort(values[bottom])]]
+        top_sum = 0.0
+        bottom_sum = 0.0
+        for j in range(n):
+            top_idx[i, j] = top[j]
+            bottom_idx[i, j] = bottom[j]
+            top_sum += R[i + 1, top_idx[i, j]]
+            bottom_sum += R[i + 1, bottom_idx[i, j]]
+        top_avg[i] = top_sum / n
+        bottom_avg[i] = bottom_sum / n
+    return top_avg, bottom_avg, top_idx, bottom_idx
+
+def build_stock_figure(ticker, price_index, normalized):
+    # Returned as decoded JSON so Dash can send it without re-validating.
+    # Plotly already ships the float32 prices as a 4-byte typed array; the
+    # dates go out as plain YYYY-MM-DD strings instead of full timestamps.
+    traded = ~np.isnan(normalized)
+    dates = price_index[traded].strftime('%Y-%m-%d').to_numpy()
+    fig = go.Figure()
+    # WebGL keeps the browser responsive on ~5,000-point daily series
+    fig.add_trace(go.Scattergl(x=dates, y=normalized[traded], mode='lines', name=ticker))
+    fig.update_layout(
+        title=f"{ticker} Normalized Price Performance",
+        xaxis_title="Date",
+        yaxis_title="Normalized Price (100 = start)",
+        template="plotly_white"
+    )
+    return json.loads(fig.to_json())
+
+@dataclass
+class DashboardState:
+    summary_df: pd.DataFrame
+    detailed_df: pd.DataFrame
+    summary_records: list
+    summary_columns: list
+    records_by_year: dict
+    detail_years: list
+    portfolio_figure: dict
+    stock_figures: dict
+
+def simulate_portfolios(prices):
+    yearly_prices = prices.resample('YE').last()
+    # Returns go back to float64 so rounded percentages and compounded
+    # portfolio values serialize without float32 noise
+    yearly_values = yearly_prices.to_numpy(dtype=np.float64)
+    annual_returns = pd.DataFrame(yearly_values[1:] / yearly_values[:-1] - 1.0,
+                                  index=yearly_prices.index[1:], columns=yearly_prices.columns)
+
+    years = annual_returns.index.year.tolist()  # e.g., 2004, 2005, ...
+    stock_names = annual_returns.columns.to_numpy()
+
+    returns_matrix = annual_returns.to_numpy()
+    current_returns = returns_matrix[:-1]
+    top_avg, bottom_avg, top_idx, bottom_idx = simulate(returns_matrix, portfolio_size)
+    top_valid = top_idx >= 0
+    bottom_valid = bottom_idx >= 0
+
+    # Portfolio values per year, starting from the initial investment
+    top_portfolio = np.empty(len(years))
+    bottom_portfolio = np.empty(len(years))
+    top_portfolio[0] = bottom_portfolio[0] = initial_value
+    np.cumprod(1 + top_avg, out=top_portfolio[1:])
+    np.cumprod(1 + bottom_avg, out=bottom_portfolio[1:])
+    top_portfolio[1:] *= initial_value
+    bottom_portfolio[1:] *= initial_value
+
+    # Columnar per-stock picks, ordered by year with the top picks first
+    years_col = np.repeat(years[1:], portfolio_size)
+    detailed_df = pd.concat([
+        pd.DataFrame({
+            "Year": years_col[valid_picks.ravel()],
+            "Category": category,
+            "Stock": stock_names[idx[valid_picks]],
+            "Return %": np.round(np.take_along_axis(current_returns, idx, axis=1)[valid_picks] * 100, 2)
         })
+        for category, idx, valid_picks in (("Top 10", top_idx, top_valid), ("Bottom 10", bottom_idx, bottom_valid))
+    ], ignore_index=True).sort_values("Year", kind="stable", ignore_index=True)
+
+    top_start, top_end = top_portfolio[:-1], top_portfolio[1:]
+    bottom_start, bottom_end = bottom_portfolio[:-1], bottom_portfolio[1:]
+
+    # Whole-column arithmetic, rounded once for the whole table
+    summary_df = pd.DataFrame({
+        "Year": years[1:],
+        "Top 10 Return %": (top_end - top_start) / top_start * 100,
+        "Bottom 10 Return %": (bottom_end - bottom_start) / bottom_start * 100,
+        "Top 10 End Value": top_end,
+        "Bottom 10 End Value": bottom_end,
+        "Top 10 Cumulative Return %": (top_end / initial_value - 1) * 100,
+        "Bottom 10 Cumulative Return %": (bottom_end / initial_value - 1) * 100
+    }).round(2)
 
-summary_rows = []
-for i in range(1, len(years)):
-    year = years[i]
-    top_start = top_portfolio[i - 1]
-    top_end = top_portfolio[i]
-    bottom_start = bottom_portfolio[i - 1]
-    bottom_end = bottom_portfolio[i]
-
-    top_return = (top_end - top_start) / top_start
-    bottom_return = (bottom_end - bottom_start) / bottom_start
-
-    summary_rows.append({
-        "Year": year,
-        "Top 10 Return %": round(top_return * 100, 2),
-        "Bottom 10 Return %": round(bottom_return * 100, 2),
-        "Top 10 End Value": round(top_end, 2),
-        "Bottom 10 End Value": round(bottom_end, 2),
-        "Top 10 Cumulative Return %": round((top_end / initial_value - 1) * 100, 2),
-        "Bottom 10 Cumulative Return %": round((bottom_end / initial_value - 1) * 100, 2)
+    df = pd.DataFrame({
+        "Year": years,
+        "Top 10 Portfolio": top_portfolio,
+        "Bottom 10 Portfolio": bottom_portfolio
     })
 
-summary_df = pd.DataFrame(summary_rows)
-detailed_df = pd.DataFrame(detailed_records)
+    return df, summary_df, detailed_df
+
+def prepare_stock_charts(prices):
+    # Normalize every ticker to 100 at its first traded day in one frame-wide pass
+    first_prices = prices.bfill().iloc[0]
+    normalized_prices = (prices / first_prices * 100).dropna(axis=1, how='all')
+
+    # One shared date index and a (days, tickers) float32 matrix for plotting
+    price_index = normalized_prices.index
+    preloaded_data = normalized_prices.to_numpy(dtype=np.float32)
+    ticker_column = {ticker: i for i, ticker in enumerate(normalized_prices.columns)}
+
+    # Every stock chart is built up front; the callback is a dict lookup
+    stock_figures = {
+        ticker: build_stock_figure(ticker, price_index, preloaded_data[:, column])
+        for ticker, column in ticker_column.items()
+    }
 
-df = pd.DataFrame({
-    "Year": years,
-    "Top 10 Portfolio": top_portfolio,
-    "Bottom 10 Portfolio": bottom_portfolio
-})
+    return stock_figures
 
-preloaded_data = {}
-for ticker in tickers:
-    series = prices[ticker].dropna()
-    if not series.empty:
-        preloaded_data[ticker] = series / series.iloc[0] * 100
+def compute_state():
+    # Downloads prices and runs the whole simulation
+
+    prices, complete = load_prices()
+    # Single precision is plenty for prices that end up as 2-decimal percentages
+    # and plotted lines, and halves the memory the frame-wide passes stream over
+    prices = prices.astype(np.float32, copy=False)
+
+    df, summary_df, detailed_df = simulate_portfolios(prices)
+    stock_figures = prepare_stock_charts(prices)
+
+    records_by_year = {
+        int(year): group[["Category", "Stock", "Return %"]].to_dict("records")
+        for year, group in detailed_df.groupby("Year", sort=False)
+    }
+
+    # Table payloads are serialized to records once and shared by every page load
+    summary_records = summary_df.to_dict("records")
+    summary_columns = [{"name": i, "id": i} for i in summary_df.columns]
+    detail_years = sorted(records_by_year)
+
+    # Encoded to plain JSON types once so Dash doesn't re-encode the pandas
+    # columns on every layout request
+    portfolio_figure = json.loads(json.dumps({
+        'data': [
+            dict(x=df["Year"], y=df["Top 10 Portfolio"], type='scatter', mode='lines+markers',
+                 name='Top 10 Strategy', line=dict(color='green')),
+            dict(x=df["Year"], y=df["Bottom 10 Portfolio"], type='scatter', mode='lines+markers',
+                 name='Bottom 10 Strategy', line=dict(color='red')),
+        ],
+        'layout': dict(
+            title='Cumulative Portfolio Value',
+            xaxis={'title': 'Year'},
+            yaxis={'title': 'Portfolio Value ($)'},
+            hovermode='x unified'
+        )
+    }, cls=plotly.utils.PlotlyJSONEncoder))
+
+    return DashboardState(
+        summary_df=summary_df,
+        detailed_df=detailed_df,
+        summary_records=summary_records,
+        summary_columns=summary_columns,
+        records_by_year=records_by_year,
+        detail_years=detail_years,
+        portfolio_figure=portfolio_figure,
+        stock_figures=stock_figures,
+    ), complete
+
+@lru_cache(maxsize=1)
+def _build_state():
+    # The computed state is persisted per schema version, ticker set and day,
+    # so restarts on the same day load it instead of re-running the pipeline
+    path = CACHE_DIR / f"state_v{STATE_VERSION}_{TICKERS_KEY}_{end_date}.joblib"
+    if path.exists():
+        try:
+            return joblib.load(path)
+        except Exception:
+            logger.warning("Ignoring unreadable dashboard state %s", path, exc_info=True)
+
+    state, complete = compute_state()
+    # A state built from a partial download is served for this process only,
+    # so a transient failure isn't persisted for the rest of the day
+    if not complete:
+        return state
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in CACHE_DIR.glob(f"state_*{TICKERS_KEY}_*.joblib"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    joblib.dump(state, tmp_path, compress=3)
+    os.replace(tmp_path, path)
+    return state
+
+_state_lock = threading.Lock()
+
+def get_state():
+    # Serializes the first build so the prefetch thread and an early request
+    # don't both download and simulate
+    with _state_lock:
+        return _build_state()
 
 # === Step 6: Dash App Layout ===
-app_dash = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], requests_pathname_prefix='/dash-layout/')
-app_dash.layout = html.Div([
-    html.H1("Winner vs Loser Portfolio Strategy"),
-
-    dcc.Graph(
-        id='portfolio-chart',
-        figure={
-            'data': [
-                dict(x=df["Year"], y=df["Top 10 Portfolio"], type='scatter', mode='lines+markers',
-                     name='Top 10 Strategy', line=dict(color='green')),
-                dict(x=df["Year"], y=df["Bottom 10 Portfolio"], type='scatter', mode='lines+markers',
-                     name='Bottom 10 Strategy', line=dict(color='red')),
+def _build_layout(state):
+    return html.Div([
+        html.H1("Winner vs Loser Portfolio Strategy"),
+
+        dcc.Graph(
+            id='portfolio-chart',
+            figure=state.portfolio_figure
+        ),
+
+        html.H2("Summary Table (Portfolio Stats)"),
+        dash_table.DataTable(
+            id='summary-table',
+            data=state.summary_records,
+            columns=state.summary_columns,
+            style_table={'marginBottom': '40px', 'overflowX': 'auto'}
+        ),
+
+        html.H2("Top & Bottom 10 Stocks by Year"),
+        html.Label("Select Year:"),
+        dcc.Dropdown(
+            id='year-dropdown',
+            options=[{"label": str(year), "value": year} for year in state.detail_years],
+            value=state.detail_years[0],
+            style={'width': '200px', 'marginBottom': '20px'}
+        ),
+        dash_table.DataTable(
+            id='yearly-detail-table',
+            columns=[
+                {"name": "Category", "id": "Category"},
+                {"name": "Stock", "id": "Stock"},
+                {"name": "Return (%)", "id": "Return %"}
             ],
-            'layout': dict(
-                title='Cumulative Portfolio Value',
-                xaxis={'title': 'Year'},
-                yaxis={'title': 'Portfolio Value ($)'},
-                hovermode='x unified'
-            )
-        }
-    ),
-
-    html.H2("Summary Table (Portfolio Stats)"),
-    dash_table.DataTable(
-        id='summary-table',
-        data=summary_df.to_dict("records"),
-        columns=[{"name": i, "id": i} for i in summary_df.columns],
-        style_table={'marginBottom': '40px', 'overflowX': 'auto'}
-    ),
-
-    html.H2("Top & Bottom 10 Stocks by Year"),
-    html.Label("Select Year:"),
-    dcc.Dropdown(
-        id='year-dropdown',
-        options=[{"label": str(year), "value": year} for year in sorted(detailed_df["Year"].unique())],
-        value=sorted(detailed_df["Year"].unique())[0],
-        style={'width': '200px', 'marginBottom': '20px'}
-    ),
-    dash_table.DataTable(
-        id='yearly-detail-table',
-        columns=[
-            {"name": "Category", "id": "Category"},
-            {"name": "Stock", "id": "Stock"},
-            {"name": "Return (%)", "id": "Return %"}
-        ],
-        style_table={'overflowX': 'auto'},
-        style_cell={'padding': '5px'},
-    ),
-
-    html.H2("Individual Stock Analysis"),
-    html.Label("Select a Stock:"),
-    dcc.Dropdown(
-        id='stock-dropdown',
-        options=[{"label": name, "value": ticker} for name, ticker in TICKER_MAP.items()],
-        value='AAPL',
-        style={'width': '300px', 'marginBottom': '20px'}
-    ),
+            style_table={'overflowX': 'auto'},
+            style_cell={'padding': '5px'},
+        ),
+
+        html.H2("Individual Stock Analysis"),
+        html.Label("Select a Stock:"),
+        dcc.Dropdown(
+            id='stock-dropdown',
+            options=[{"label": name, "value": ticker} for name, ticker in TICKER_MAP.items()],
+            value='AAPL',
+            style={'width': '300px', 'marginBottom': '20px'}
+        ),
+        dcc.Graph(id='stock-performance')
+    ])
+
+app_dash = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], requests_pathname_prefix='/dash-layout/')
+# Dash calls a function layout per page load, so importing this module (and
+# FastAPI's "/") doesn't wait for the download and simulation. Without a
+# validation layout Dash would call the function right away to check the
+# callback ids, so a data-free one with the same ids is given instead.
+app_dash.validation_layout = html.Div([
+    dcc.Graph(id='portfolio-chart'),
+    dash_table.DataTable(id='summary-table'),
+    dcc.Dropdown(id='year-dropdown'),
+    dash_table.DataTable(id='yearly-detail-table'),
+    dcc.Dropdown(id='stock-dropdown'),
     dcc.Graph(id='stock-performance')
 ])
+app_dash.layout = lambda: _build_layout(get_state())
 
 # === Callback for Yearly Detail Table ===
 @app_dash.callback(
@@ -178,8 +435,7 @@ app_dash.layout = html.Div([
     Input('year-dropdown', 'value')
 )
 def update_yearly_detail_table(selected_year):
-    filtered = detailed_df[detailed_df["Year"] == selected_year]
-    return filtered[["Category", "Stock", "Return %"]].to_dict("records")
+    return get_state().records_by_year.get(selected_year, [])
 
 # === Callback for Stock Chart ===
 @app_dash.callback(
@@ -187,16 +443,30 @@ def update_yearly_detail_table(selected_year):
     Input('stock-dropdown', 'value')
 )
 def update_stock_chart(ticker):
-    if ticker not in preloaded_data or preloaded_data[ticker].empty:
+    figure = get_state().stock_figures.get(ticker)
+    if figure is None:
         return go.Figure(layout={"title": f"No data available for {ticker}"})
+    return figure
 
-    normalized = preloaded_data[ticker]
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=normalized.index, y=normalized, mode='lines', name=ticker))
-    fig.update_layout(
-        title=f"{ticker} Normalized Price Performance",
-        xaxis_title="Date",
-        yaxis_title="Normalized Price (100 = start)",
-        template="plotly_white"
-    )
-    return fig
\ No newline at end of file
+# === Arrow endpoints for the summary and detail tables ===
+router = APIRouter()
+
+@lru_cache(maxsize=None)
+def table_ipc(name):
+    # Serialized to an Arrow IPC stream once; every response reuses the bytes
+    table = pa.Table.from_pandas(getattr(get_state(), name), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+@router.get("/summary.arrow")
+def summary_arrow():
+    return Response(table_ipc("summary_df"), media_type="application/vnd.apache.arrow.stream")
+
+@router.get("/detailed.arrow")
+def detailed_arrow():
+    return Response(table_ipc("detailed_df"), media_type="application/vnd.apache.arrow.stream")
+
+# Warm the state in the background so the first dashboard hit rarely waits
+threading.Thread(target=get_state, daemon=True).start()
\ No newline at end of file
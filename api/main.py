@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.wsgi import WSGIMiddleware
-from .graph import app_dash
+from .graph import app_dash, router
 
 app = FastAPI()
 
@@ -8,4 +8,6 @@ app = FastAPI()
 def read_root():
     return {"message": "Hello, World!"}
 
+app.include_router(router)
+
 app.mount('/dash-layout', WSGIMiddleware(app_dash.server))
\ No newline at end of file